@@ -1,4 +1,3 @@
-import rfc8785
 import json
 from decimal import Decimal, ROUND_HALF_EVEN
 
@@ -57,22 +56,20 @@ def generate_ver():
     # 1. Execute deterministic logic
     action, sl, tp = run_aura_gold_logic(h4_high, h4_low, current_bid, rsi_val)
 
-    # 2. Build Schema (Strict adherence to VER v1.0)
-    ver = {
-        "version": "1.0",
-        "context": {"engine": "anchor-v1", "logic_hash": "6a8e...f3"},
-        "input": {
-            "symbol": str(symbol),
-            "h4_high": to_fixed(h4_high),
-            "h4_low": to_fixed(h4_low),
-            "current_bid": to_fixed(current_bid),
-            "rsi_val": to_fixed(rsi_val),
-        },
-        "output": {"action": action, "sl": to_fixed(sl), "tp": to_fixed(tp)},
-    }
-
-    # 3. Canonicalize (RFC 8785)
-    return rfc8785.dumps(ver).decode("utf-8")
+    # 2. Emit canonical VER v1.0 (RFC 8785) directly.
+    # The schema is fixed, so keys are written pre-sorted. Numeric fields are
+    # fixed-point strings and action is an enum, so neither needs escaping;
+    # symbol is the only free-form string and goes through a JSON encoder.
+    return (
+        '{"context":{"engine":"anchor-v1","logic_hash":"6a8e...f3"},'
+        f'"input":{{"current_bid":"{to_fixed(current_bid)}",'
+        f'"h4_high":"{to_fixed(h4_high)}",'
+        f'"h4_low":"{to_fixed(h4_low)}",'
+        f'"rsi_val":"{to_fixed(rsi_val)}",'
+        f'"symbol":{json.dumps(str(symbol), ensure_ascii=False)}}},'
+        f'"output":{{"action":"{action}","sl":"{to_fixed(sl)}","tp":"{to_fixed(tp)}"}},'
+        '"version":"1.0"}'
+    )
 
 
 if __name__ == "__main__":
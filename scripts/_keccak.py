@@ -0,0 +1,81 @@
+"""
+anchor Keccak-256 backend
+Binds the fastest available Keccak-256 implementation once at import time.
+
+Preference order:
+    1. pysha3            (direct C binding, no wrapper object)
+    2. pycryptodome      (installed via eth-hash[pycryptodome])
+    3. eth_hash.auto     (backend-autodetecting facade, slowest per call)
+
+All backends produce the legacy Keccak-256 digest used by the contract,
+NOT the NIST SHA3-256 variant. Any bytes-like input (bytes, bytearray,
+memoryview) is accepted.
+"""
+
+from typing import Callable, Optional, Union
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+try:
+    from sha3 import keccak_256 as _keccak_256
+
+    KECCAK_BACKEND = "pysha3"
+except ImportError:
+    try:
+        from Crypto.Hash import keccak as _crypto_keccak
+
+        KECCAK_BACKEND = "pycryptodome"
+    except ImportError:
+        from eth_hash.auto import keccak as _eth_keccak
+
+        KECCAK_BACKEND = "eth_hash"
+
+
+def _keccak_pysha3(data: BytesLike) -> bytes:
+    return _keccak_256(data).digest()
+
+
+def _keccak_pycryptodome(data: BytesLike) -> bytes:
+    return _crypto_keccak.new(digest_bits=256, data=data).digest()
+
+
+def _keccak_eth_hash(data: BytesLike) -> bytes:
+    # eth_hash only accepts bytes/bytearray; bytes() is free for bytes
+    return _eth_keccak(bytes(data))
+
+
+keccak: Callable[[BytesLike], bytes]
+if KECCAK_BACKEND == "pysha3":
+    keccak = _keccak_pysha3
+elif KECCAK_BACKEND == "pycryptodome":
+    keccak = _keccak_pycryptodome
+else:
+    keccak = _keccak_eth_hash
+
+# Known-answer check, run once at import: a backend that silently computes
+# NIST SHA3-256 (a7ffc6f8...) would break every digest against the contract
+if keccak(b"").hex() != (
+    "c5d2460186f7233c927e7db2dcc703c0e500b653ca82273b7bfad8045d85a470"
+):
+    raise RuntimeError(f"{KECCAK_BACKEND} backend is not legacy Keccak-256")
+
+
+def keccak_midstate(prefix: bytes) -> Optional[Callable[[BytesLike], bytes]]:
+    """
+    Absorb a constant prefix once and return a hasher for prefix || data.
+
+    Each call clones the prefix-absorbed state and absorbs only `data`.
+    Returns None when the bound backend cannot clone hash state (only
+    pysha3 can), so callers keep their full-message path.
+    """
+    if KECCAK_BACKEND != "pysha3":
+        return None
+
+    clone = _keccak_256(prefix).copy
+
+    def digest_suffix(data: BytesLike) -> bytes:
+        h = clone()
+        h.update(data)
+        return h.digest()
+
+    return digest_suffix
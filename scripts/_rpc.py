@@ -0,0 +1,48 @@
+"""
+anchor RPC connection
+Process-wide HTTP session and Web3 instance shared by the scripts.
+
+Loads the repo-root .env once and keeps a single keep-alive
+requests.Session, so every RPC in a process reuses the same pooled
+connections instead of paying a TCP+TLS handshake per script or call.
+"""
+
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import requests
+from requests.adapters import HTTPAdapter
+
+if TYPE_CHECKING:
+    from web3 import Web3
+
+# Load environment variables from .env file
+try:
+    from dotenv import load_dotenv
+
+    load_dotenv(dotenv_path=Path(__file__).resolve().parents[1] / ".env")
+except ImportError:
+    pass  # dotenv not available, use system env vars
+
+
+@lru_cache(maxsize=1)
+def get_session() -> requests.Session:
+    """Keep-alive session; the pool is sized for concurrent batch sends."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+@lru_cache(maxsize=1)
+def get_w3() -> "Web3":
+    """Web3 bound to RPC_URL over the shared session (web3 imported lazily)."""
+    from web3 import Web3
+
+    rpc_url = os.getenv("RPC_URL")
+    if not rpc_url:
+        raise ValueError("RPC_URL not found in .env")
+    return Web3(Web3.HTTPProvider(rpc_url, session=get_session()))
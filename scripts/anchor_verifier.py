@@ -1,8 +1,19 @@
+import hmac
 import json
+import logging
+import struct
 from dataclasses import dataclass
-from typing import Dict, Tuple
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
-from eth_utils import keccak
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads  # type: ignore[assignment]
+
+from _keccak import keccak
+
+logger = logging.getLogger("anchor.verifier")
 
 # ============================================================
 # CONSTANTS (Must match firmware + contract)
@@ -10,6 +21,39 @@ from eth_utils import keccak
 
 anchor_RCT_DOMAIN = b"anchor_RCT_V1"  # 13 bytes
 
+# receipt_material = DOMAIN || hw || fw || exec || counter_be  (117 bytes),
+# packed in one call
+_RECEIPT_MATERIAL = struct.Struct(">13s32s32s32sQ")
+
+_U64BE = struct.Struct(">Q")  # counter encoding
+
+
+# ============================================================
+# HEX DECODING
+# ============================================================
+
+
+def _parse_32byte_hex(value: str, field: str) -> bytes:
+    if not isinstance(value, str) or value[:2] != "0x":
+        raise ValueError(f"{field} must be 0x-prefixed hex")
+
+    raw = bytes.fromhex(value[2:])
+    if len(raw) != 32:
+        raise ValueError(f"{field} must be 32 bytes")
+
+    return raw
+
+
+# hardware_identity / firmware_hash repeat on every receipt from the same
+# node, so their decode is memoized. exec hash and digest change per receipt.
+_parse_32byte_hex_cached = lru_cache(maxsize=1024)(_parse_32byte_hex)
+
+
+def _parse_device_hex(value: str, field: str) -> bytes:
+    if isinstance(value, str):
+        return _parse_32byte_hex_cached(value, field)
+    return _parse_32byte_hex(value, field)  # rejects non-str (unhashable) input
+
 
 # ============================================================
 # DATA STRUCTURES
@@ -22,13 +66,32 @@ class NodeState:
     last_counter: int = 0
 
 
+@dataclass(slots=True, frozen=True)
+class Receipt:
+    hardware_identity: bytes
+    firmware_hash: bytes
+    execution_hash: bytes
+    receipt_digest: bytes
+    counter: int
+
+
+def _receipt_material(receipt: Receipt) -> bytes:
+    return _RECEIPT_MATERIAL.pack(
+        anchor_RCT_DOMAIN,
+        receipt.hardware_identity,
+        receipt.firmware_hash,
+        receipt.execution_hash,
+        receipt.counter,
+    )
+
+
 # ============================================================
 # CANONICAL VERIFIER
 # ============================================================
 
 
 class AnchorVerifier:
-    def __init__(self):
+    def __init__(self) -> None:
         self.authorized_nodes: Dict[bytes, NodeState] = {}
         self.approved_firmware: set[bytes] = set()
 
@@ -36,116 +99,171 @@ class AnchorVerifier:
     # ADMIN METHODS
     # --------------------------------------------------------
 
-    def add_authorized_node(self, hardware_identity_hex: str, name: str):
-        hw = self._parse_32byte_hex(hardware_identity_hex, "hardware_identity")
+    def add_authorized_node(self, hardware_identity_hex: str, name: str) -> None:
+        hw = _parse_32byte_hex(hardware_identity_hex, "hardware_identity")
         self.authorized_nodes[hw] = NodeState(name=name)
-        print(f"✓ Authorized node added: {name}")
+        logger.info("✓ Authorized node added: %s", name)
 
-    def add_approved_firmware(self, firmware_hash_hex: str):
-        fw = self._parse_32byte_hex(firmware_hash_hex, "firmware_hash")
+    def add_approved_firmware(self, firmware_hash_hex: str) -> None:
+        fw = _parse_32byte_hex(firmware_hash_hex, "firmware_hash")
         self.approved_firmware.add(fw)
-        print(f"✓ Approved firmware added: {firmware_hash_hex[:18]}...")
+        logger.info("✓ Approved firmware added: %s...", firmware_hash_hex[:18])
 
     # --------------------------------------------------------
     # VERIFICATION ENTRYPOINT
     # --------------------------------------------------------
 
     def verify_attestation(self, receipt_json: str) -> Tuple[bool, str]:
-        print("\n" + "=" * 70)
-        print("  anchor CANONICAL VERIFIER - Receipt Validation")
-        print("=" * 70)
-
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("=" * 70)
+            logger.debug("  anchor CANONICAL VERIFIER - Receipt Validation")
+            logger.debug("=" * 70)
+
+        ok, reason = self._verify_one(receipt_json, debug)
+
+        if debug and ok:
+            logger.debug("✓ VALID: Receipt authorized for anchoring")
+        return ok, reason
+
+    def verify_attestations_batch(
+        self, receipt_jsons: List[str]
+    ) -> List[Tuple[bool, str]]:
+        """
+        Verify many receipts, returning one (ok, reason) per input, in order.
+
+        Results (and counter state) are identical to calling
+        verify_attestation on each receipt in order, without the per-receipt
+        debug trace.
+        """
+        results = [self._verify_one(receipt_json) for receipt_json in receipt_jsons]
+
+        if logger.isEnabledFor(logging.DEBUG):
+            valid = sum(1 for ok, _ in results if ok)
+            logger.debug("✓ Batch verified: %s/%s receipts valid", valid, len(results))
+        return results
+
+    def _verify_one(self, receipt_json: str, debug: bool = False) -> Tuple[bool, str]:
+        """The full check sequence for one receipt; debug adds the step trace."""
         try:
-            receipt = json.loads(receipt_json)
-        except Exception:
-            return False, "Invalid JSON"
-
-        required_fields = [
-            "hardware_identity",
-            "firmware_hash",
-            "execution_hash",
-            "receipt_digest",
-            "counter",
-        ]
-
-        for field in required_fields:
-            if field not in receipt:
-                return False, f"Missing field: {field}"
-
-        # Parse fields
-        hw = self._parse_32byte_hex(receipt["hardware_identity"], "hardware_identity")
-        fw = self._parse_32byte_hex(receipt["firmware_hash"], "firmware_hash")
-        ex = self._parse_32byte_hex(receipt["execution_hash"], "execution_hash")
-        digest_received = self._parse_32byte_hex(
-            receipt["receipt_digest"], "receipt_digest"
-        )
+            fields, hw = self._parse_identity(receipt_json)
+        except ValueError as e:
+            return False, str(e)
 
-        counter = receipt["counter"]
-        if not isinstance(counter, int) or counter < 0:
-            return False, "Invalid counter"
-
-        print(f"Node: {hw.hex()}")
-        print(f"Counter: {counter}")
-        print("-" * 70)
+        if debug:
+            logger.debug("Node: %s", hw.hex())
+            logger.debug("-" * 70)
 
         # ----------------------------------------------------
-        # 1️⃣ Identity Check
+        # 1️⃣ Identity Check (before decoding the rest, so
+        #    unauthorized probes stay cheap)
         # ----------------------------------------------------
-        if hw not in self.authorized_nodes:
+        node = self._lookup_node(hw)
+        if node is None:
             return False, "Unauthorized hardware identity"
 
-        node = self.authorized_nodes[hw]
-        print(f"[1/4] ✓ Identity Check Passed: {node.name}")
+        if debug:
+            logger.debug("[1/4] ✓ Identity Check Passed: %s", node.name)
+
+        try:
+            receipt = self._parse_rest(fields, hw)
+        except ValueError as e:
+            return False, str(e)
+
+        fw = receipt.firmware_hash
+        counter = receipt.counter
 
         # ----------------------------------------------------
         # 2️⃣ Firmware Check
         # ----------------------------------------------------
-        if fw not in self.approved_firmware:
+        if not self._is_approved_firmware(fw):
             return False, "Unapproved firmware hash"
 
-        print(f"[2/4] ✓ Firmware Check Passed")
+        if debug:
+            logger.debug("[2/4] ✓ Firmware Check Passed")
 
         # ----------------------------------------------------
-        # 3️⃣ Monotonic Counter Check
+        # 3️⃣ Monotonic Counter Check (stale counters are replays
+        #    whatever their digest, so they skip hashing)
         # ----------------------------------------------------
         if counter <= node.last_counter:
             return False, "Replay detected (counter not strictly increasing)"
 
-        print(f"[3/4] ✓ Monotonicity Check Passed: {counter} > {node.last_counter}")
+        if debug:
+            logger.debug(
+                "[3/4] ✓ Monotonicity Check Passed: %s > %s",
+                counter,
+                node.last_counter,
+            )
 
         # ----------------------------------------------------
         # 4️⃣ Digest Reconstruction
         # ----------------------------------------------------
-        expected_digest = keccak(
-            anchor_RCT_DOMAIN + hw + fw + ex + counter.to_bytes(8, "big")
-        )
+        expected_digest = keccak(_receipt_material(receipt))
 
-        if expected_digest != digest_received:
+        if not hmac.compare_digest(expected_digest, receipt.receipt_digest):
             return False, "Receipt digest mismatch"
 
-        print(f"[4/4] ✓ Digest Reconstruction Passed")
+        if debug:
+            logger.debug("[4/4] ✓ Digest Reconstruction Passed")
 
         # ----------------------------------------------------
         # STATE UPDATE (CRITICAL)
         # ----------------------------------------------------
         node.last_counter = counter
-
-        print("✓ VALID: Receipt authorized for anchoring\n")
         return True, "Valid receipt"
 
     # --------------------------------------------------------
     # INTERNAL UTILITIES
     # --------------------------------------------------------
 
-    def _parse_32byte_hex(self, value: str, field: str) -> bytes:
-        if not isinstance(value, str) or not value.startswith("0x"):
-            raise ValueError(f"{field} must be 0x-prefixed hex")
+    def _lookup_node(self, hw: bytes) -> Optional[NodeState]:
+        return self.authorized_nodes.get(hw)
 
-        raw = bytes.fromhex(value[2:])
-        if len(raw) != 32:
-            raise ValueError(f"{field} must be 32 bytes")
+    def _is_approved_firmware(self, fw: bytes) -> bool:
+        return fw in self.approved_firmware
 
-        return raw
+    def _parse_identity(self, receipt_json: str) -> Tuple[Dict[str, Any], bytes]:
+        """Decode JSON and hardware_identity only; the rest waits for auth."""
+        try:
+            fields = _json_loads(receipt_json)
+        except Exception:
+            raise ValueError("Invalid JSON") from None
+
+        if not isinstance(fields, dict):
+            raise ValueError("Invalid JSON")
+
+        required_fields = [
+            "hardware_identity",
+            "firmware_hash",
+            "execution_hash",
+            "receipt_digest",
+            "counter",
+        ]
+
+        for field in required_fields:
+            if field not in fields:
+                raise ValueError(f"Missing field: {field}")
+
+        hw = _parse_device_hex(fields["hardware_identity"], "hardware_identity")
+        return fields, hw
+
+    def _parse_rest(self, fields: Dict[str, Any], hw: bytes) -> Receipt:
+        counter = fields["counter"]
+        if not isinstance(counter, int) or not 0 <= counter < 2**64:
+            raise ValueError("Invalid counter")
+
+        return Receipt(
+            hardware_identity=hw,
+            firmware_hash=_parse_device_hex(fields["firmware_hash"], "firmware_hash"),
+            execution_hash=_parse_32byte_hex(
+                fields["execution_hash"], "execution_hash"
+            ),
+            receipt_digest=_parse_32byte_hex(
+                fields["receipt_digest"], "receipt_digest"
+            ),
+            counter=counter,
+        )
 
 
 # ============================================================
@@ -153,6 +271,8 @@ class AnchorVerifier:
 # ============================================================
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
+
     verifier = AnchorVerifier()
 
     hw_hex = "0x52fdfc072182654f163f5f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f"
@@ -161,20 +281,24 @@ if __name__ == "__main__":
     verifier.add_authorized_node(hw_hex, "Development_ESP32_S3_Alpha")
     verifier.add_approved_firmware(fw_hex)
 
-    def build_receipt(counter: int):
-        hw = bytes.fromhex(hw_hex[2:])
-        fw = bytes.fromhex(fw_hex[2:])
-        ex = bytes.fromhex(
-            "deadbeefcafebabe000000000000000000000000000000000000000000000001"
-        )
+    ex_hex = "0xdeadbeefcafebabe000000000000000000000000000000000000000000000001"
 
-        digest = keccak(anchor_RCT_DOMAIN + hw + fw + ex + counter.to_bytes(8, "big"))
+    # Everything but the counter is fixed: build the material prefix once
+    material_prefix = (
+        anchor_RCT_DOMAIN
+        + bytes.fromhex(hw_hex[2:])
+        + bytes.fromhex(fw_hex[2:])
+        + bytes.fromhex(ex_hex[2:])
+    )
+
+    def build_receipt(counter: int) -> str:
+        digest = keccak(material_prefix + _U64BE.pack(counter))
 
         return json.dumps(
             {
                 "hardware_identity": hw_hex,
                 "firmware_hash": fw_hex,
-                "execution_hash": "0xdeadbeefcafebabe000000000000000000000000000000000000000000000001",
+                "execution_hash": ex_hex,
                 "receipt_digest": "0x" + digest.hex(),
                 "counter": counter,
             }
@@ -191,4 +315,19 @@ if __name__ == "__main__":
     # Increment
     assert verifier.verify_attestation(build_receipt(6))[0]
 
+    # Batch: valid, in-batch replay, malformed, increment, unauthorized,
+    # stale counter
+    batch = verifier.verify_attestations_batch(
+        [
+            build_receipt(7),
+            build_receipt(7),
+            "null",
+            build_receipt(8),
+            build_receipt(9).replace(hw_hex, "0x" + "11" * 32),
+            build_receipt(3),
+        ]
+    )
+    assert [ok for ok, _ in batch] == [True, False, False, True, False, False]
+    assert batch[5][1].startswith("Replay detected")
+
     print("\nALL TESTS PASSED\n")
@@ -1,17 +1,11 @@
 import os
-from pathlib import Path
 from web3 import Web3
+from web3.exceptions import ContractLogicError
 from eth_account import Account
-from dotenv import load_dotenv
+from _rpc import get_w3
 
-load_dotenv(dotenv_path=Path(__file__).resolve().parents[1] / ".env")
-
-# 1. Setup Connection
-rpc_url = os.getenv("RPC_URL")
-if not rpc_url:
-    raise ValueError("RPC_URL not found in .env")
-
-w3 = Web3(Web3.HTTPProvider(rpc_url))
+# 1. Setup Connection (.env is loaded by _rpc)
+w3 = get_w3()
 print(f"Connected to Arbitrum: {w3.is_connected()}")
 
 # 2. Account Configuration
@@ -42,6 +36,56 @@ abi = [
 
 contract = w3.eth.contract(address=contract_address, abi=abi)
 
+CHAIN_ID = 421614
+MAX_FEE_PER_GAS = w3.to_wei(0.1, "gwei")
+MAX_PRIORITY_FEE_PER_GAS = w3.to_wei(0.01, "gwei")
+FALLBACK_GAS = 2000000  # used when estimation reverts
+
+
+def authorize_many(node_ids: list[bytes]) -> list:
+    """
+    Authorize several node IDs with one nonce lookup.
+
+    The nonce is fetched once and incremented locally. Gas is estimated per
+    node (plus 20% headroom) instead of hard-coding it: authorizeNode is a
+    storage insert, and writing a fresh slot costs roughly ten times more
+    than rewriting one that is already set. If the estimate reverts (e.g.
+    the caller is not the owner), that node is sent with FALLBACK_GAS so its
+    receipt reports the revert. All transactions are signed and sent before
+    any receipt is awaited, so confirmations overlap.
+    """
+    if not node_ids:
+        return []
+
+    nonce = w3.eth.get_transaction_count(admin_account.address)
+
+    tx_hashes = []
+    for i, node_id in enumerate(node_ids):
+        authorize = contract.functions.authorizeNode(node_id)
+        try:
+            gas = authorize.estimate_gas({"from": admin_account.address}) * 6 // 5
+        except ContractLogicError as e:
+            print(f"⚠️  Gas estimate for {node_id.hex()} reverted: {e}")
+            gas = FALLBACK_GAS
+        tx = authorize.build_transaction(
+            {
+                "from": admin_account.address,
+                "nonce": nonce + i,
+                "gas": gas,
+                "maxFeePerGas": MAX_FEE_PER_GAS,
+                "maxPriorityFeePerGas": MAX_PRIORITY_FEE_PER_GAS,
+                "chainId": CHAIN_ID,
+            }
+        )
+        signed_tx = admin_account.sign_transaction(tx)
+        tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        print(f"🚀 Transaction Sent! Hash: {tx_hash.hex()}")
+        tx_hashes.append(tx_hash)
+
+    print("Waiting for confirmation on Arbitrum Sepolia...")
+    return [w3.eth.wait_for_transaction_receipt(h) for h in tx_hashes]
+
+
 # 4. Define the Virtual Node ID (Matches our previous discussion)
 hw_id_hex = "79493f063a9316d8a39e80e66699a0937c802f54032d80d28591873130d2222d"
 node_id = Web3.to_bytes(hexstr=hw_id_hex)
@@ -49,23 +93,7 @@ node_id = Web3.to_bytes(hexstr=hw_id_hex)
 print(f"Authorizing Virtual Node ID: {node_id.hex()}")
 
 # 5. Build, Sign, and Send Transaction
-tx = contract.functions.authorizeNode(node_id).build_transaction(
-    {
-        "from": admin_account.address,
-        "nonce": w3.eth.get_transaction_count(admin_account.address),
-        "gas": 2000000,
-        "maxFeePerGas": w3.to_wei(0.1, "gwei"),
-        "maxPriorityFeePerGas": w3.to_wei(0.01, "gwei"),
-        "chainId": 421614,
-    }
-)
-
-signed_tx = admin_account.sign_transaction(tx)
-tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-
-print(f"🚀 Transaction Sent! Hash: {tx_hash.hex()}")
-print("Waiting for confirmation on Arbitrum Sepolia...")
-receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+(receipt,) = authorize_many([node_id])
 
 if receipt["status"] == 1:
     print(f"✅ Confirmed in block: {receipt['blockNumber']}")
@@ -2,45 +2,56 @@
 
 import argparse
 import os
+import struct
 from dataclasses import dataclass
+from typing import Union
 
-# Load environment variables from .env file
-try:
-    from dotenv import load_dotenv
-
-    load_dotenv()
-except ImportError:
-    pass  # dotenv not available, use system env vars
-
-from eth_hash.auto import keccak
+import _rpc  # noqa: F401  (loads .env once per process)
+from _keccak import keccak, keccak_midstate
 
 DOMAIN = b"anchor_RCT_V1"
 CHAIN_ID_DEFAULT = 421614
 PACKED_V1_LEN = 137
+# DOMAIN || u64be(chain_id) || hw_id || fw_hash || exec_hash || u64be(counter)
+DIGEST_MATERIAL_LEN = len(DOMAIN) + 8 + 32 + 32 + 32 + 8
 
+_U64BE = struct.Struct(">Q").pack
+_U64BE_INTO = struct.Struct(">Q").pack_into
 
-def _strip_0x(s: str) -> str:
-    return s[2:] if s.startswith("0x") else s
+EXEC_PREFIX = b"exec:"
+# Keccak state with EXEC_PREFIX already absorbed (None if the backend
+# cannot clone state; callers then hash the full message)
+_exec_suffix_digest = keccak_midstate(EXEC_PREFIX)
+# Full 13-byte exec message (b"exec:" || u64be(counter)) in one pack
+_EXEC_MESSAGE = struct.Struct(">5sQ").pack
 
 
-def _hex32_to_bytes(s: str) -> bytes:
-    s = _strip_0x(s)
-    if len(s) != 64:
-        raise ValueError(f"expected 32-byte hex (64 chars), got {len(s)}")
-    return bytes.fromhex(s)
+def _hex32_to_bytes(s: Union[str, bytes]) -> bytes:
+    if isinstance(s, bytes):
+        if len(s) != 32:
+            raise ValueError(f"expected 32 bytes, got {len(s)}")
+        return s
+    b = bytes.fromhex(s[2:] if s[:2] == "0x" else s)
+    if len(b) != 32:
+        raise ValueError(f"expected 32-byte hex (64 chars), got {len(b)} bytes")
+    return b
 
 
 def _u64be(x: int) -> bytes:
-    if x < 0 or x >= 2**64:
-        raise ValueError("counter must fit into uint64")
-    return x.to_bytes(8, "big")
+    # struct does the uint64 range check in C; keep the public ValueError
+    try:
+        return _U64BE(x)
+    except struct.error:
+        raise ValueError("counter must fit into uint64") from None
 
 
 def compute_digest(
     chain_id: int, hw_id: bytes, fw_hash: bytes, exec_hash: bytes, counter: int
 ) -> bytes:
-    material = DOMAIN + _u64be(chain_id) + hw_id + fw_hash + exec_hash + _u64be(counter)
-    return keccak(material)
+    # One join allocates the 125-byte material once instead of once per "+"
+    return keccak(
+        b"".join((DOMAIN, _U64BE(chain_id), hw_id, fw_hash, exec_hash, _U64BE(counter)))
+    )
 
 
 def pack_v1(
@@ -58,7 +69,13 @@ def pack_v1(
 
 
 def exec_hash_for(counter: int) -> bytes:
-    return keccak(b"exec:" + _u64be(counter))
+    # Both packers range-check the counter in C, as _u64be does
+    try:
+        if _exec_suffix_digest is not None:
+            return _exec_suffix_digest(_U64BE(counter))
+        return keccak(_EXEC_MESSAGE(EXEC_PREFIX, counter))
+    except struct.error:
+        raise ValueError("counter must fit into uint64") from None
 
 
 @dataclass
@@ -73,20 +90,58 @@ def make_single_args(
 ) -> SingleArgs:
     ex = exec_hash_for(counter)
     d = compute_digest(chain_id, hw_id, fw_hash, ex, counter)
-    bad = bytearray(d)
-    bad[-1] ^= 1
-    return SingleArgs(exec_hash=ex, claimed_digest=d, claimed_digest_bad=bytes(bad))
+    bad = d[:31] + bytes((d[31] ^ 1,))
+    return SingleArgs(exec_hash=ex, claimed_digest=d, claimed_digest_bad=bad)
 
 
 def make_packed_batch(
     chain_id: int, hw_id: bytes, fw_hash: bytes, start_counter: int, n: int
 ) -> bytes:
-    out = bytearray()
-    for i in range(n):
-        counter = start_counter + i
-        ex = exec_hash_for(counter)
-        d = compute_digest(chain_id, hw_id, fw_hash, ex, counter)
-        out += pack_v1(chain_id, hw_id, fw_hash, ex, counter, d)
+    # Row offsets below assume 32-byte ids; check once instead of per row
+    if len(hw_id) != 32 or len(fw_hash) != 32:
+        raise ValueError("hw_id and fw_hash must be 32 bytes")
+    if start_counter < 0 or start_counter + n > 2**64:
+        raise ValueError("counter must fit into uint64")
+
+    counters = range(start_counter, start_counter + n)
+    if _exec_suffix_digest is not None:
+        exec_hashes = [_exec_suffix_digest(_U64BE(c)) for c in counters]
+    else:
+        exec_hashes = [keccak(_EXEC_MESSAGE(EXEC_PREFIX, c)) for c in counters]
+
+    # Digest materials as one contiguous block: the constant prefix is
+    # stamped into every row up front, only exec_hash || counter is filled in.
+    prefix = DOMAIN + _U64BE(chain_id) + hw_id + fw_hash
+    tail = len(prefix)
+    materials = bytearray((prefix + bytes(DIGEST_MATERIAL_LEN - tail)) * n)
+    for i, (ex, counter) in enumerate(zip(exec_hashes, counters)):
+        base = i * DIGEST_MATERIAL_LEN + tail
+        materials[base : base + 32] = ex
+        _U64BE_INTO(materials, base + 32, counter)
+
+    # The 85-byte prefix is identical for every row: absorb it once and
+    # hash only each row's 40-byte exec_hash || counter tail when possible.
+    view = memoryview(materials)
+    offsets = range(0, n * DIGEST_MATERIAL_LEN, DIGEST_MATERIAL_LEN)
+    digest_suffix = keccak_midstate(prefix)
+    if digest_suffix is not None:
+        digests = [
+            digest_suffix(view[off + tail : off + DIGEST_MATERIAL_LEN])
+            for off in offsets
+        ]
+    else:
+        digests = [keccak(view[off : off + DIGEST_MATERIAL_LEN]) for off in offsets]
+
+    # Packed v1 rows (same layout as pack_v1), preallocated and filled in
+    # place: 0x01 || hw_id || fw_hash || exec_hash || u64be(counter) || digest
+    out = bytearray(PACKED_V1_LEN * n)
+    prefix = b"\x01" + hw_id + fw_hash
+    for i, (ex, counter, d) in enumerate(zip(exec_hashes, counters, digests)):
+        base = i * PACKED_V1_LEN
+        out[base : base + 65] = prefix
+        out[base + 65 : base + 97] = ex
+        _U64BE_INTO(out, base + 97, counter)
+        out[base + 105 : base + 137] = d
     return bytes(out)
 
 
@@ -5,80 +5,91 @@ Generates cryptographically valid test receipts for verifier testing
 """
 
 import json
-from eth_hash.auto import keccak
+import struct
+from typing import Any, Dict, Optional, Union
+
+from _keccak import keccak
 
 anchor_RCT_DOMAIN = b"anchor_RCT_V1"
+RECEIPT_MATERIAL_LEN = 117
+
+# DOMAIN(13) || hw(32) || fw(32) || exec(32) || counter_be(8)
+_RECEIPT_MATERIAL = struct.Struct(">13s32s32s32sQ")
+assert _RECEIPT_MATERIAL.size == RECEIPT_MATERIAL_LEN
+
+# Default test values (raw bytes, so the default path skips hex handling)
+DEFAULT_HARDWARE_IDENTITY = bytes.fromhex(
+    "52fdfc072182654f163f5f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f"
+)
+DEFAULT_FIRMWARE_HASH = bytes.fromhex(
+    "1234567890abcdef1234567890abcdef1234567890abcdef1234567890abcdef"
+)
+DEFAULT_EXECUTION_HASH = bytes.fromhex(
+    "deadbeefcafebabe000000000000000000000000000000000000000000000001"
+)
+
+
+def _to_bytes32(value: Union[str, bytes], name: str) -> bytes:
+    """Accept raw 32 bytes as-is, or 64 hex chars with optional 0x prefix"""
+    if isinstance(value, (bytes, bytearray)):
+        if len(value) != 32:
+            raise ValueError(f"{name} must be 32 bytes, got {len(value)}")
+        return bytes(value)
+
+    value = value.removeprefix("0x")
+    if len(value) != 64:
+        raise ValueError(f"{name} must be 64 hex chars, got {len(value)}")
+    return bytes.fromhex(value)
 
 
 def generate_test_receipt(
-    hardware_identity: str = None,
-    firmware_hash: str = None,
-    execution_hash: str = None,
+    hardware_identity: Optional[Union[str, bytes]] = None,
+    firmware_hash: Optional[Union[str, bytes]] = None,
+    execution_hash: Optional[Union[str, bytes]] = None,
     counter: int = 1,
-) -> dict:
+) -> Dict[str, Any]:
     """
     Generate a cryptographically valid test receipt
 
     Args:
-        hardware_identity: 32-byte hex (defaults to test value)
-        firmware_hash: 32-byte hex (defaults to test value)
-        execution_hash: 32-byte hex (defaults to test value)
+        hardware_identity: 32 raw bytes or 32-byte hex (None uses test value)
+        firmware_hash: 32 raw bytes or 32-byte hex (None uses test value)
+        execution_hash: 32 raw bytes or 32-byte hex (None uses test value)
         counter: uint64 counter value
 
     Returns:
         dict: Valid receipt with correct digest
+
+    Raises:
+        ValueError: If a hash is not 32 bytes or counter exceeds uint64
     """
-    # Use defaults if not provided
     if hardware_identity is None:
-        hardware_identity = (
-            "52fdfc072182654f163f5f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f0f"
-        )
-
+        hardware_identity = DEFAULT_HARDWARE_IDENTITY
     if firmware_hash is None:
-        firmware_hash = (
-            "1234567890abcdef1234567890abcdef1234567890abcdef1234567890abcdef"
-        )
-
+        firmware_hash = DEFAULT_FIRMWARE_HASH
     if execution_hash is None:
-        execution_hash = (
-            "deadbeefcafebabe000000000000000000000000000000000000000000000001"
-        )
-
-    # Remove 0x prefix if present
-    hardware_identity = hardware_identity.replace("0x", "")
-    firmware_hash = firmware_hash.replace("0x", "")
-    execution_hash = execution_hash.replace("0x", "")
-
-    # Validate lengths
-    assert (
-        len(hardware_identity) == 64
-    ), f"hardware_identity must be 64 hex chars, got {len(hardware_identity)}"
-    assert (
-        len(firmware_hash) == 64
-    ), f"firmware_hash must be 64 hex chars, got {len(firmware_hash)}"
-    assert (
-        len(execution_hash) == 64
-    ), f"execution_hash must be 64 hex chars, got {len(execution_hash)}"
-    assert 0 <= counter < 2**64, f"counter must fit in uint64, got {counter}"
-
-    # Convert to bytes
-    hw_id_bytes = bytes.fromhex(hardware_identity)
-    fw_hash_bytes = bytes.fromhex(firmware_hash)
-    exec_hash_bytes = bytes.fromhex(execution_hash)
-    counter_be = counter.to_bytes(8, "big")
-
-    # Compute canonical receipt digest
-    receipt_material = (
-        anchor_RCT_DOMAIN + hw_id_bytes + fw_hash_bytes + exec_hash_bytes + counter_be
+        execution_hash = DEFAULT_EXECUTION_HASH
+
+    # bytes inputs (firmware-pipeline mode) skip hex decoding entirely
+    hw_id_bytes = _to_bytes32(hardware_identity, "hardware_identity")
+    fw_hash_bytes = _to_bytes32(firmware_hash, "firmware_hash")
+    exec_hash_bytes = _to_bytes32(execution_hash, "execution_hash")
+    if not 0 <= counter < 2**64:
+        raise ValueError(f"counter must fit in uint64, got {counter}")
+
+    # The fixed 117-byte layout in a single C-level pack
+    receipt_material = _RECEIPT_MATERIAL.pack(
+        anchor_RCT_DOMAIN, hw_id_bytes, fw_hash_bytes, exec_hash_bytes, counter
     )
 
+    # Compute canonical receipt digest
     receipt_digest = keccak(receipt_material)
 
     # Build receipt
     receipt = {
-        "hardware_identity": "0x" + hardware_identity,
-        "firmware_hash": "0x" + firmware_hash,
-        "execution_hash": "0x" + execution_hash,
+        "hardware_identity": "0x" + hw_id_bytes.hex(),
+        "firmware_hash": "0x" + fw_hash_bytes.hex(),
+        "execution_hash": "0x" + exec_hash_bytes.hex(),
         "receipt_digest": "0x" + receipt_digest.hex(),
         "counter": counter,
     }
@@ -86,12 +97,12 @@ def generate_test_receipt(
     return receipt
 
 
-def print_receipt(receipt: dict):
+def print_receipt(receipt: Dict[str, Any]) -> None:
     """Pretty-print a receipt"""
     print(json.dumps(receipt, indent=2))
 
 
-def verify_receipt_format(receipt: dict) -> bool:
+def verify_receipt_format(receipt: Dict[str, Any]) -> bool:
     """Verify a receipt has the correct format"""
     required_fields = [
         "hardware_identity",
@@ -3,18 +3,25 @@
 import argparse
 import json
 import os
-import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from typing import Any, Dict, List, Tuple
 
-# Load environment variables from .env file
-try:
-    from dotenv import load_dotenv
+import requests
+from eth_abi import decode as abi_decode, encode as abi_encode
+from eth_abi.exceptions import DecodingError
+from eth_account import Account
+from eth_account.signers.local import LocalAccount
+from eth_utils import function_signature_to_4byte_selector, to_checksum_address
 
-    load_dotenv()
+try:
+    from orjson import loads as _json_loads
 except ImportError:
-    pass  # dotenv not available, use system env vars
+    from json import loads as _json_loads  # type: ignore[assignment]
 
+from _rpc import get_session  # also loads .env
 from benchmark_receipts import (
     CHAIN_ID_DEFAULT,
     _hex32_to_bytes,
@@ -22,6 +29,47 @@ from benchmark_receipts import (
     make_single_args,
 )
 
+RPC_TIMEOUT = 30.0  # seconds per JSON-RPC request
+RECEIPT_POLL_INTERVAL = 0.5
+RECEIPT_TIMEOUT = 120.0
+
+
+@dataclass(frozen=True)
+class AbiFunction:
+    signature: str
+    selector: bytes
+    arg_types: Tuple[str, ...]
+
+    @classmethod
+    def define(cls, name: str, *arg_types: str) -> "AbiFunction":
+        signature = f"{name}({','.join(arg_types)})"
+        return cls(
+            signature, function_signature_to_4byte_selector(signature), arg_types
+        )
+
+
+# Selectors are hashed once at import, not per call
+FN_INITIALIZE = AbiFunction.define("initialize")
+# was authorize_node
+FN_AUTHORIZE_NODE = AbiFunction.define("authorizeNode", "bytes32")
+# was approve_firmware
+FN_APPROVE_FIRMWARE = AbiFunction.define("approveFirmware", "bytes32")
+FN_IS_NODE_AUTHORIZED = AbiFunction.define("isNodeAuthorized", "bytes32")
+FN_IS_FIRMWARE_APPROVED = AbiFunction.define("isFirmwareApproved", "bytes32")
+FN_GET_COUNTER = AbiFunction.define("getCounter", "bytes32")
+# was verify_receipts_batch_bitset_bytes
+FN_BATCH_BITSET = AbiFunction.define("verifyReceiptsBatchBitsetBytes", "bytes")
+FN_BATCH_BOOL = AbiFunction.define("verifyReceiptsBatchBytes", "bytes")
+# was verify_receipt
+FN_VERIFY_RECEIPT = AbiFunction.define(
+    "verifyReceipt", "bytes32", "bytes32", "bytes32", "uint64", "bytes32"
+)
+
+# Multicall3 is deployed at the same address on Arbitrum Sepolia and most
+# other chains; used to fold the pre-setup status reads into one eth_call
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+FN_AGGREGATE3 = AbiFunction.define("aggregate3", "(address,bool,bytes)[]")
+
 
 def _must_env(name: str) -> str:
     v = os.environ.get(name, "")
@@ -30,40 +78,101 @@ def _must_env(name: str) -> str:
     return v
 
 
-def _run(cmd: List[str]) -> str:
-    p = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-    if p.returncode != 0:
-        raise SystemExit(
-            "Command failed:\n"
-            + " ".join(cmd)
-            + "\n\nSTDOUT:\n"
-            + p.stdout
-            + "\n\nSTDERR:\n"
-            + p.stderr
+def _rpc(rpc_url: str, method: str, params: List[Any]) -> Any:
+    try:
+        resp = get_session().post(
+            rpc_url,
+            json={"jsonrpc": "2.0", "method": method, "params": params, "id": 1},
+            timeout=RPC_TIMEOUT,
         )
-    return p.stdout.strip()
-
-
-def _cast_send_json(args: List[str]) -> Dict[str, Any]:
-    out = _run(["cast", "send", "--json"] + args)
+    except requests.RequestException as e:
+        raise SystemExit(f"RPC {method} failed: {e}")
+    if resp.status_code != 200:
+        raise SystemExit(f"RPC {method} failed: HTTP {resp.status_code}\n{resp.text}")
     try:
-        return json.loads(out)
+        # Receipts can carry kilobytes of logs; orjson parses the raw body
+        body = _json_loads(resp.content)
     except json.JSONDecodeError:
-        raise SystemExit(f"Failed to parse JSON from cast send output:\n{out}")
+        raise SystemExit(f"Failed to parse JSON from {method} response:\n{resp.text}")
+    if "error" in body:
+        raise SystemExit(f"RPC {method} failed: {body['error']}")
+    return body["result"]
+
+
+def _encode_call(fn: AbiFunction, *args: Any) -> bytes:
+    return fn.selector + abi_encode(fn.arg_types, args)
+
+
+def _calldata(fn: AbiFunction, *args: Any) -> str:
+    return "0x" + _encode_call(fn, *args).hex()
+
+
+def _eth_call(rpc_url: str, contract: str, data: str) -> bytes:
+    result = _rpc(rpc_url, "eth_call", [{"to": contract, "data": data}, "latest"])
+    return bytes.fromhex(result[2:])
 
 
-def _cast_receipt_json(tx_hash: str, rpc_url: str) -> Dict[str, Any]:
-    out = _run(["cast", "receipt", "--json", tx_hash, "--rpc-url", rpc_url])
+def _is_set_up(rpc_url: str, contract: str, hw_id: bytes, fw_hash: bytes) -> bool:
+    """
+    True if the node is authorized and the firmware approved.
+
+    Both reads go out as one Multicall3 aggregate3 eth_call; chains without
+    Multicall3 (e.g. a local devnet) return empty data and fall back to two
+    direct eth_calls.
+    """
+    target = bytes.fromhex(contract[2:])
+    calls = [
+        (target, False, _encode_call(FN_IS_NODE_AUTHORIZED, hw_id)),
+        (target, False, _encode_call(FN_IS_FIRMWARE_APPROVED, fw_hash)),
+    ]
+    raw = _eth_call(rpc_url, MULTICALL3_ADDRESS, _calldata(FN_AGGREGATE3, calls))
+    if not raw:
+        return all(any(_eth_call(rpc_url, contract, "0x" + c[2].hex())) for c in calls)
     try:
-        return json.loads(out)
-    except json.JSONDecodeError:
-        raise SystemExit(f"Failed to parse JSON from cast receipt output:\n{out}")
+        (results,) = abi_decode(["(bool,bytes)[]"], raw)
+    except DecodingError:
+        raise SystemExit(f"Failed to decode aggregate3 result: 0x{raw.hex()}")
+    return all(any(ret) for _ok, ret in results)
+
+
+def _sign_tx(
+    account: LocalAccount,
+    contract: str,
+    data: str,
+    nonce: int,
+    gas_limit: int,
+    gas_price: int,
+    chain_id: int,
+) -> str:
+    tx: Dict[str, Any] = {
+        "to": contract,
+        "data": data,
+        "value": 0,
+        "nonce": nonce,
+        "gas": gas_limit,
+        "gasPrice": gas_price,
+        "chainId": chain_id,
+    }
+    signed = account.sign_transaction(tx)
+    return "0x" + signed.raw_transaction.hex().removeprefix("0x")
+
+
+def _wait_for_receipt(tx_hash: str, rpc_url: str) -> Dict[str, Any]:
+    deadline = time.monotonic() + RECEIPT_TIMEOUT
+    while True:
+        receipt = _rpc(rpc_url, "eth_getTransactionReceipt", [tx_hash])
+        if receipt is not None:
+            return receipt
+        if time.monotonic() > deadline:
+            raise SystemExit(f"Timed out waiting for receipt of {tx_hash}")
+        time.sleep(RECEIPT_POLL_INTERVAL)
 
 
 def _gas_used(receipt: Dict[str, Any]) -> int:
     v = receipt.get("gasUsed")
     if isinstance(v, str):
-        return int(v, 0)
+        # JSON-RPC quantities are always 0x-prefixed hex
+        return int(v, 16)
     if isinstance(v, int):
         return v
     raise SystemExit(f"Unexpected gasUsed in receipt: {v}")
@@ -72,22 +181,20 @@ def _gas_used(receipt: Dict[str, Any]) -> int:
 def _status(receipt: Dict[str, Any]) -> int:
     v = receipt.get("status")
     if isinstance(v, str):
-        return int(v, 0)
+        # JSON-RPC quantities are always 0x-prefixed hex
+        return int(v, 16)
     if isinstance(v, int):
         return v
     raise SystemExit(f"Unexpected status in receipt: {v}")
 
 
-def _send_and_measure(
-    label: str, send_args: List[str], rpc_url: str
-) -> Tuple[str, int, int]:
+def _send_and_measure(label: str, raw_tx: str, rpc_url: str) -> Tuple[str, int, int]:
     try:
-        send = _cast_send_json(send_args)
-        tx = send.get("transactionHash") or send.get("hash")
+        tx = _rpc(rpc_url, "eth_sendRawTransaction", [raw_tx])
         if not tx:
-            raise SystemExit(f"cast send JSON missing transaction hash: {send}")
+            raise SystemExit(f"eth_sendRawTransaction returned no hash for {label}")
 
-        receipt = _cast_receipt_json(tx, rpc_url)
+        receipt = _wait_for_receipt(tx, rpc_url)
         return tx, _gas_used(receipt), _status(receipt)
     except SystemExit as e:
         # Check if this is an expected error
@@ -136,6 +243,22 @@ def main() -> None:
 
     sizes = [int(x.strip()) for x in args.sizes.split(",") if x.strip()]
 
+    account: LocalAccount = Account.from_key(pk)
+    # Transactions are signed locally with explicit nonces; only the raw
+    # bytes go over the wire
+    nonce = int(
+        _rpc(rpc_url, "eth_getTransactionCount", [account.address, "pending"]), 16
+    )
+    gas_price = int(_rpc(rpc_url, "eth_gasPrice", []), 16)
+
+    # eth_account only signs EIP-55 checksummed recipients
+    tx_to = to_checksum_address(contract)
+
+    def _sign(data: str, tx_nonce: int) -> str:
+        return _sign_tx(
+            account, tx_to, data, tx_nonce, args.gas_limit, gas_price, args.chain_id
+        )
+
     results: List[Dict[str, Any]] = []
 
     # Auto-setup if single verification tests need contract state
@@ -143,30 +266,8 @@ def main() -> None:
     if not args.setup:
         # Check if contract is already initialized by checking node authorization and firmware approval
         try:
-            auth_result = _run(
-                [
-                    "cast",
-                    "call",
-                    contract,
-                    "isNodeAuthorized(bytes32)",
-                    hw_hex,
-                    "--rpc-url",
-                    rpc_url,
-                ]
-            )
-            fw_result = _run(
-                [
-                    "cast",
-                    "call",
-                    contract,
-                    "isFirmwareApproved(bytes32)",
-                    fw_hex,
-                    "--rpc-url",
-                    rpc_url,
-                ]
-            )
             # If either node is not authorized or firmware is not approved, we need setup
-            if "false" in auth_result.lower() or "false" in fw_result.lower():
+            if not _is_set_up(rpc_url, contract, hw_id, fw_hash):
                 setup_needed = True
         except SystemExit:
             # If call fails entirely, we need setup
@@ -176,26 +277,19 @@ def main() -> None:
         print("🔧 Setting up contract state for verification tests...")
         setup_results = []
         for fn, fn_args in [
-            ("initialize()", []),
-            ("authorizeNode(bytes32)", [hw_hex]),  # was authorize_node
-            ("approveFirmware(bytes32)", [fw_hex]),  # was approve_firmware
+            (FN_INITIALIZE, []),
+            (FN_AUTHORIZE_NODE, [hw_id]),
+            (FN_APPROVE_FIRMWARE, [fw_hash]),
         ]:
             tx, gas, st = _send_and_measure(
-                fn,
-                [
-                    contract,
-                    fn,
-                    *fn_args,
-                    "--rpc-url",
-                    rpc_url,
-                    "--private-key",
-                    pk,
-                    "--gas-limit",
-                    str(args.gas_limit),
-                ],
-                rpc_url,
+                fn.signature, _sign(_calldata(fn, *fn_args), nonce), rpc_url
+            )
+            # Rejected sends never reach the chain and don't consume the nonce
+            if tx not in ("skipped", "unauthorized"):
+                nonce += 1
+            setup_results.append(
+                {"label": fn.signature, "tx": tx, "gasUsed": gas, "status": st}
             )
-            setup_results.append({"label": fn, "tx": tx, "gasUsed": gas, "status": st})
 
             # If we got unauthorized error, stop trying setup functions
             if tx == "unauthorized":
@@ -209,33 +303,25 @@ def main() -> None:
             results.extend(setup_results)
 
     # Batch benchmarks
+    # Sizes are independent, so their sends run concurrently. Nonces are
+    # assigned up front so on-chain order still follows `sizes`.
+    batch_fn = FN_BATCH_BITSET if args.batch_fn == "bitset" else FN_BATCH_BOOL
+
+    batch_jobs: List[Tuple[str, str]] = []
     for n in sizes:
         packed = make_packed_batch(args.chain_id, hw_id, fw_hash, 1, n)
-        packed_hex = "0x" + packed.hex()
-
-        if args.batch_fn == "bitset":
-            sig = "verifyReceiptsBatchBitsetBytes(bytes)"  # was verify_receipts_batch_bitset_bytes
-        else:
-            sig = "verifyReceiptsBatchBytes(bytes)"
-
-        tx, gas, st = _send_and_measure(
-            f"batch_{n}",
-            [
-                contract,
-                sig,
-                packed_hex,
-                "--rpc-url",
-                rpc_url,
-                "--private-key",
-                pk,
-                "--gas-limit",
-                str(args.gas_limit),
-            ],
-            rpc_url,
+        batch_jobs.append((f"batch_{n}", _sign(_calldata(batch_fn, packed), nonce)))
+        nonce += 1
+
+    with ThreadPoolExecutor(max_workers=max(len(batch_jobs), 1)) as pool:
+        measured = list(
+            pool.map(lambda job: _send_and_measure(job[0], job[1], rpc_url), batch_jobs)
         )
+
+    for n, (tx, gas, st) in zip(sizes, measured):
         results.append(
             {
-                "label": f"{sig} N={n}",
+                "label": f"{batch_fn.signature} N={n}",
                 "tx": tx,
                 "gasUsed": gas,
                 "status": st,
@@ -246,36 +332,23 @@ def main() -> None:
 
     # Single success + single failure (invalid digest)
     # Read the live counter after all batch runs complete
-    counter_raw = _run(
-        ["cast", "call", contract, "getCounter(bytes32)", hw_hex, "--rpc-url", rpc_url]
-    )
-    current_counter = int(counter_raw, 16)
+    counter_raw = _eth_call(rpc_url, contract, _calldata(FN_GET_COUNTER, hw_id))
+    current_counter = int.from_bytes(counter_raw, "big")
     single = make_single_args(args.chain_id, hw_id, fw_hash, current_counter)
 
-    def _hex32(b: bytes) -> str:
-        return "0x" + b.hex()
-
-    sig_single = (
-        "verifyReceipt(bytes32,bytes32,bytes32,uint64,bytes32)"  # was verify_receipt
-    )
-
     tx, gas, st = _send_and_measure(
         "single_success",
-        [
-            contract,
-            sig_single,
-            hw_hex,
-            fw_hex,
-            _hex32(single.exec_hash),
-            "1",
-            _hex32(single.claimed_digest),
-            "--rpc-url",
-            rpc_url,
-            "--private-key",
-            pk,
-            "--gas-limit",
-            str(args.gas_limit),
-        ],
+        _sign(
+            _calldata(
+                FN_VERIFY_RECEIPT,
+                hw_id,
+                fw_hash,
+                single.exec_hash,
+                1,
+                single.claimed_digest,
+            ),
+            nonce,
+        ),
         rpc_url,
     )
     results.append(
@@ -284,21 +357,17 @@ def main() -> None:
 
     tx, gas, st = _send_and_measure(
         "single_invalid_digest",
-        [
-            contract,
-            sig_single,
-            hw_hex,
-            fw_hex,
-            _hex32(single.exec_hash),
-            "1",
-            _hex32(single.claimed_digest_bad),
-            "--rpc-url",
-            rpc_url,
-            "--private-key",
-            pk,
-            "--gas-limit",
-            str(args.gas_limit),
-        ],
+        _sign(
+            _calldata(
+                FN_VERIFY_RECEIPT,
+                hw_id,
+                fw_hash,
+                single.exec_hash,
+                1,
+                single.claimed_digest_bad,
+            ),
+            nonce + 1,
+        ),
         rpc_url,
     )
     results.append(
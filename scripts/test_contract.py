@@ -1,16 +1,11 @@
 from web3 import Web3
 import os
-from pathlib import Path
-from dotenv import load_dotenv
+from functools import lru_cache
+from eth_abi import decode as abi_decode, encode as abi_encode
+from _rpc import get_w3
 
-load_dotenv(dotenv_path=Path(__file__).resolve().parents[1] / ".env")
-
-# 1. Connection
-rpc_url = os.getenv("RPC_URL")
-if not rpc_url:
-    raise ValueError("RPC_URL not found in .env")
-
-w3 = Web3(Web3.HTTPProvider(rpc_url))
+# 1. Connection (.env is loaded by _rpc; keep-alive session shared by all calls)
+w3 = get_w3()
 print(f"Connected to Arbitrum: {w3.is_connected()}")
 
 # 2. Fix: Checksummed Address (Mandatory for web3.py)
@@ -21,31 +16,27 @@ if not contract_address:
 contract_address = w3.to_checksum_address(contract_address)
 
 # 3. Fix: CamelCase Names (To match Stylus export)
-abi = [
-    {
-        "inputs": [{"name": "node_id", "type": "bytes32"}],
-        "name": "isNodeAuthorized",
-        "outputs": [{"name": "", "type": "bool"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [{"name": "fw_hash", "type": "bytes32"}],
-        "name": "isFirmwareApproved",
-        "outputs": [{"name": "", "type": "bool"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-    {
-        "inputs": [{"name": "node_id", "type": "bytes32"}],
-        "name": "getCounter",
-        "outputs": [{"name": "", "type": "uint64"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-]
+# name -> (input types, output types)
+functions = {
+    "isNodeAuthorized": (["bytes32"], ["bool"]),
+    "isFirmwareApproved": (["bytes32"], ["bool"]),
+    "getCounter": (["bytes32"], ["uint64"]),
+}
+
+
+@lru_cache(maxsize=None)
+def calldata(fn_name: str, *args) -> bytes:
+    """Selector + ABI-encoded args, built once per (function, args)."""
+    input_types = functions[fn_name][0]
+    selector = Web3.keccak(text=f"{fn_name}({','.join(input_types)})")[:4]
+    return selector + abi_encode(input_types, args)
+
+
+def call(fn_name: str, *args):
+    raw = w3.eth.call({"to": contract_address, "data": calldata(fn_name, *args)})
+    (value,) = abi_decode(functions[fn_name][1], raw)
+    return value
 
-contract = w3.eth.contract(address=contract_address, abi=abi)
 
 # 4. Correct Test Data
 test_node = bytes.fromhex("11" * 32)
@@ -55,21 +46,21 @@ print(f"\n--- Orthonode OHR Testing ---")
 
 # Test 1: Node Auth
 try:
-    is_auth = contract.functions.isNodeAuthorized(test_node).call()
+    is_auth = call("isNodeAuthorized", test_node)
     print(f"✅ Test 1 - isNodeAuthorized: {is_auth} (Expected: False)")
 except Exception as e:
     print(f"❌ Test 1 Failed: {e}")
 
 # Test 2: Firmware Auth
 try:
-    is_fw = contract.functions.isFirmwareApproved(test_fw).call()
+    is_fw = call("isFirmwareApproved", test_fw)
     print(f"✅ Test 2 - isFirmwareApproved: {is_fw} (Expected: False)")
 except Exception as e:
     print(f"❌ Test 2 Failed: {e}")
 
 # Test 3: Counter
 try:
-    count = contract.functions.getCounter(test_node).call()
+    count = call("getCounter", test_node)
     print(f"✅ Test 3 - getCounter: {count} (Expected: 0)")
 except Exception as e:
     print(f"❌ Test 3 Failed: {e}")